@@ -1,22 +1,44 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-import json
+import plotly.graph_objects as go
+import orjson
+import os
 from streamlit_plotly_events import plotly_events
 
+COLOR_CYCLE = tuple(px.colors.qualitative.Plotly + px.colors.qualitative.Set1 + px.colors.qualitative.Pastel)
+
 # Load the data
 @st.cache_data
 def load_data():
+    # Reuse the parquet copy of models.json while it is at least as new as the JSON file and this script
+    if os.path.exists('models.parquet') and os.path.getmtime('models.parquet') >= max(os.path.getmtime('models.json'), os.path.getmtime(__file__)):
+        return pd.read_parquet('models.parquet', engine='pyarrow', memory_map=True)
     try:
-        with open('models.json', 'r') as f:
-            data = json.load(f)
-        df = pd.DataFrame(data)
-        df['Release Date'] = pd.to_datetime(df['Release Date'], format='%Y-%m-%d', errors='coerce')
+        with open('models.json', 'rb') as f:
+            data = orjson.loads(f.read())
+        df = pd.DataFrame.from_records(data, columns=['Model', 'Organization', 'Release Date'])
+        df['Model'] = df['Model'].astype('string[pyarrow]')
+        df['Release Date'] = pd.to_datetime(df['Release Date'], format='%Y-%m-%d', errors='coerce', cache=True)
         df = df.dropna(subset=['Release Date'])
-        df['Organization'] = df['Organization'].fillna('Unknown')
-        df['Year-Month'] = df['Release Date'].dt.to_period('M').astype(str)
+        if df.empty:
+            # Without any dated rows there is no month range; the page shows its no-data message
+            return df
+        # Keep rows in release order so date ranges can be sliced instead of masked
+        df = df.sort_values('Release Date', kind='stable', ignore_index=True)
+        df['Organization'] = df['Organization'].fillna('Unknown').astype('category')
+        # Year-Month is an ordered category over every month in range, built from integer month codes
+        month_codes = df['Release Date'].to_numpy().astype('datetime64[M]').astype(np.int64)
+        months = pd.period_range(df['Release Date'].min(), df['Release Date'].max(), freq='M').strftime('%Y-%m')
+        df['Year-Month'] = pd.Categorical.from_codes(month_codes - month_codes.min(), categories=months, ordered=True)
+        try:
+            df.to_parquet('models.parquet', engine='pyarrow', compression='zstd')
+        except OSError:
+            # A read-only checkout just goes without the parquet copy
+            pass
         return df
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         st.error(f"Error parsing JSON file: {str(e)}")
         st.error("Please check your models.json file for syntax errors.")
         st.error(f"Error occurs near line {e.lineno}, column {e.colno}")
@@ -25,17 +47,167 @@ def load_data():
         st.code("".join(lines[max(0, e.lineno-3):e.lineno+2]), language="json")
         return pd.DataFrame()
 
-def calculate_release_cycle(df, company, last_release_date):
-    company_df = df[df['Organization'] == company]
-    first_release_date = company_df['Release Date'].min()
-    num_models = company_df.shape[0]
-    if num_models > 1:
-        total_days = (last_release_date - first_release_date).days
-        average_cycle = total_days / num_models
-        months = int(average_cycle // 30)
-        days = int(average_cycle % 30)
-        return average_cycle, months, days
-    return None, None, None
+@st.cache_data
+def all_release_cycles(_df, last_release_date):
+    # The leading underscore keeps Streamlit from hashing the already cached frame
+    stats = _df.groupby('Organization', observed=True, sort=False)['Release Date'].agg(first='min', n='size')
+    stats = stats[stats['n'] > 1]
+    cycle_days = (last_release_date - stats['first']).dt.days / stats['n']
+    months, days = np.divmod(cycle_days.to_numpy().astype(int), 30)
+    cycles = pd.DataFrame({'cycle_days': cycle_days, 'months': months, 'days': days}, index=stats.index)
+    return cycles.sort_values('cycle_days')
+
+def filter_data(df, companies, start_date, end_date):
+    # df is sorted by release date, so the date range is a contiguous slice
+    start = df['Release Date'].searchsorted(np.datetime64(start_date), side='left')
+    end = df['Release Date'].searchsorted(np.datetime64(end_date), side='right')
+    filtered_df = df.iloc[start:end]
+    if companies:
+        # Compare the integer category codes in NumPy rather than going through a pandas isin
+        company_codes = filtered_df['Organization'].cat.categories.get_indexer(companies)
+        filtered_df = filtered_df[np.isin(filtered_df['Organization'].cat.codes.to_numpy(), company_codes)]
+    return filtered_df
+
+def show_release_table(df):
+    # Streamlit formats the release date as a month on the client, so the frame is shown as is
+    st.dataframe(df, column_config={'Release Date': st.column_config.DateColumn(format='YYYY-MM')})
+
+# The next three helpers are keyed on the filter inputs, which fully determine the filtered frame,
+# so the frame itself is not hashed
+@st.cache_data
+def compute_monthly(_filtered_df, companies, start_date, end_date):
+    months = _filtered_df['Year-Month'].cat.categories
+    organizations = _filtered_df['Organization'].cat.categories
+    month_codes = _filtered_df['Year-Month'].cat.codes.to_numpy().astype(np.intp)
+    org_codes = _filtered_df['Organization'].cat.codes.to_numpy().astype(np.intp)
+
+    # Count every (month, company) pair in one pass over the category codes
+    counts = np.bincount(month_codes * len(organizations) + org_codes, minlength=len(months) * len(organizations))
+    counts = counts.reshape(len(months), len(organizations))
+
+    # Keep only the months and companies present in the filtered data, as int32
+    # (counts are small, and the narrower type halves the memory the cumsum streams through)
+    observed_months = counts.any(axis=1)
+    observed_orgs = counts.any(axis=0)
+    counts = counts[np.ix_(observed_months, observed_orgs)].astype(np.int32)
+    index = pd.Index(months[observed_months], name='Year-Month')
+    columns = pd.Index(organizations[observed_orgs], name='Organization')
+
+    monthly_counts = pd.DataFrame(counts, index=index, columns=columns)
+    cumulative_counts = pd.DataFrame(counts.cumsum(axis=0, dtype=np.int32), index=index, columns=columns)
+    return monthly_counts, cumulative_counts, frozenset(index)
+
+@st.cache_data
+def index_filtered(_filtered_df, companies, start_date, end_date):
+    # Row positions per company and per month
+    org_index = _filtered_df.groupby('Organization', observed=True, sort=False).indices
+    month_index = _filtered_df.groupby('Year-Month', observed=True, sort=False).indices
+    return org_index, month_index
+
+@st.cache_data
+def company_options_for(_filtered_df, companies, start_date, end_date):
+    company_model_counts = _filtered_df['Organization'].value_counts()
+    company_model_counts = company_model_counts[company_model_counts > 0]
+    company_options = company_model_counts.index.astype(str) + ' (' + company_model_counts.values.astype(str) + ' models)'
+    return tuple(company_model_counts.index), tuple(company_options)
+
+@st.cache_data
+def build_color_map(all_companies):
+    # Keyed on every company rather than the filtered ones so colors stay put when filters change
+    return {company: COLOR_CYCLE[i % len(COLOR_CYCLE)] for i, company in enumerate(all_companies)}
+
+def style_main_figure(fig, max_date):
+    fig.update_layout(
+        legend=dict(orientation='h', y=-0.2, xanchor='center', x=0.5),
+        hovermode='x unified',
+        xaxis_range=['2022-06', (max_date - pd.DateOffset(months=1)).strftime('%Y-%m')]
+    )
+
+    # Remove the legend
+    fig.update_layout(showlegend=False)
+    return fig
+
+# The monthly graph builders are keyed on the filter inputs rather than on a hash of the plot data,
+# so Plotly figure construction only runs when the filters or the data type change.
+# They share one signature so GRAPH_BUILDERS[graph_type](...) can call either; the total line has no use for the colors
+@st.cache_resource(max_entries=8)
+def build_stacked_area_figure(_plot_data, title_prefix, companies, start_date, end_date, _company_colors, max_date):
+    # One stacked trace per company built straight from the wide counts,
+    # without plotly express reshaping them into long form first.
+    # The hover reads the company from the trace name, so no per-point data is needed
+    fig = go.Figure([
+        go.Scatter(x=_plot_data.index, y=_plot_data[company], name=company, mode='lines',
+                   stackgroup='one', line=dict(color=_company_colors[company]),
+                   hovertemplate="%{fullData.name}, %{x} (%{y} models)<extra></extra>")
+        for company in _plot_data.columns
+    ])
+    fig.update_layout(title=f'{title_prefix} by Company (Stacked Area)',
+                      xaxis_title='Month', yaxis_title='Number of Models')
+    return style_main_figure(fig, max_date)
+
+@st.cache_resource(max_entries=8)
+def build_line_total_figure(_plot_data, title_prefix, companies, start_date, end_date, _company_colors, max_date):
+    plot_data_total = _plot_data.sum(axis=1)
+    # A single WebGL line trace
+    fig = go.Figure(go.Scattergl(x=plot_data_total.index, y=plot_data_total.values, mode='lines',
+                                 hovertemplate="%{x} (%{y} models)"))
+    fig.update_layout(title=f'{title_prefix} (Total)',
+                      xaxis_title='Month', yaxis_title='Number of Models')
+    return style_main_figure(fig, max_date)
+
+# Graph type options in the sidebar, mapped to the function that builds each graph
+GRAPH_BUILDERS = {
+    "Stacked Area": build_stacked_area_figure,
+    "Line (Total)": build_line_total_figure,
+}
+
+@st.cache_resource
+def build_fastest_figure(avg_cycles_df, company_colors):
+    # Cached on the per-company cycles, so the bar chart is only rebuilt when the data changes.
+    # A single bar trace colored per company, with the inverted cycle so the fastest get the highest bars
+    fig_fastest = go.Figure(go.Bar(x=avg_cycles_df['Company'], y=avg_cycles_df['Average Cycle (inverse)'],
+                                   marker_color=avg_cycles_df['Company'].map(company_colors).tolist(),
+                                   text=avg_cycles_df['Average Cycle (days)']))
+
+    fig_fastest.update_layout(title='Fastest Releasing Companies',
+                              xaxis_title='Company', yaxis_title='Speed of Release (1/days)',
+                              showlegend=False, bargap=0.2)
+
+    # Update hover template to show company and average cycle in days
+    fig_fastest.update_traces(texttemplate='%{text:.1f} days', textposition='outside',
+                              hovertemplate='%{x}<br>Average Cycle: %{text:.1f} days')
+    return fig_fastest
+
+@st.fragment
+def per_company_section(filtered_df, company_names, company_options, org_index, company_cycles):
+    # Picking another company only reruns this section, not the whole page
+    selected_company_option = st.selectbox('Select a company:', company_options)
+    selected_company = company_names[company_options.index(selected_company_option)]
+
+    # Rows are stored oldest first; list the company's models newest first
+    company_df = filtered_df.take(org_index[selected_company][::-1])
+
+    # Show company-level release cycle
+    if selected_company in company_cycles.index:
+        company_months, company_days_remainder = company_cycles.loc[selected_company, ['months', 'days']]
+        st.markdown(f"""
+            <div class="release-cycle">
+                <i class="fa fa-clock-o release-cycle-icon" aria-hidden="true"></i>
+                <span class="release-cycle-company">{selected_company}</span> <span> releases a new model every  </span> <span class="release-cycle-time"> {company_months} months and {company_days_remainder} days</span>
+            </div>
+        """, unsafe_allow_html=True)
+
+    st.write(f"Models released by {selected_company}:")
+    show_release_table(company_df[['Model', 'Release Date']])
+
+@st.fragment
+def per_month_section(filtered_df, months, month_index):
+    # Picking another month only reruns this section, not the whole page
+    selected_month = st.selectbox('Select a month:', months, index=0)
+
+    month_df = filtered_df.take(month_index[selected_month][::-1])
+    st.write(f"Models released in {selected_month}:")
+    show_release_table(month_df[['Model', 'Organization', 'Release Date']])
 
 df = load_data()
 
@@ -94,24 +266,21 @@ if not df.empty:
     # Display last update note
     st.markdown(f"**Last update:** {last_release_date.strftime('%Y-%m-%d')}")
 
-    # Filter out companies with only one model
-    model_counts = df['Organization'].value_counts()
-    companies_with_multiple_models = model_counts[model_counts > 1].index.tolist()
-    df_filtered = df[df['Organization'].isin(companies_with_multiple_models)]
-
-    # Calculate company-level release cycles
-    company_cycles = {company: calculate_release_cycle(df_filtered, company, last_release_date) for company in df_filtered['Organization'].unique()}
+    # Calculate company-level release cycles (companies with only one model are left out)
+    company_cycles = all_release_cycles(df, last_release_date)
 
     # Calculate the average release cycle for each company
-    company_avg_cycles = {company: cycle[0] for company, cycle in company_cycles.items() if cycle[0] is not None}
-    avg_cycles_df = pd.DataFrame(list(company_avg_cycles.items()), columns=['Company', 'Average Cycle (days)'])
-    avg_cycles_df = avg_cycles_df.sort_values(by='Average Cycle (days)')
-
-    # Calculate overall average release cycle from avg_cycles_df
-    if not avg_cycles_df.empty:
-        overall_average_cycle_days = avg_cycles_df['Average Cycle (days)'].mean()
-        overall_months = int(overall_average_cycle_days // 30)
-        overall_days = int(overall_average_cycle_days % 30)
+    # (already sorted fastest first; the inverse puts the fastest companies on the highest bars)
+    cycle_days = company_cycles['cycle_days'].to_numpy()
+    avg_cycles_df = pd.DataFrame({
+        'Company': company_cycles.index.to_numpy(),
+        'Average Cycle (days)': cycle_days,
+        'Average Cycle (inverse)': 1 / cycle_days,
+    })
+
+    # Calculate overall average release cycle from the per-company cycles
+    if not company_cycles.empty:
+        overall_months, overall_days = divmod(int(cycle_days.mean()), 30)
     else:
         overall_months, overall_days = 0, 0
 
@@ -136,27 +305,25 @@ if not df.empty:
     )
     graph_type = st.sidebar.radio(
         "Select graph type:",
-        ("Stacked Area", "Line (Total)")
+        tuple(GRAPH_BUILDERS)
     )
 
     # Filter by company
-    all_companies = df['Organization'].unique()
+    all_companies = df['Organization'].cat.categories
     selected_companies = st.sidebar.multiselect('Select companies:', all_companies)
     
     # Filter by date range
     min_date = df['Release Date'].min()
     max_date = df['Release Date'].max()
     start_date, end_date = st.sidebar.date_input('Select date range:', [min_date, max_date], min_value=min_date, max_value=max_date)
-    
-    # Convert start_date and end_date to datetime
-    start_date = pd.to_datetime(start_date)
-    end_date = pd.to_datetime(end_date)
 
     # Apply filters
-    if selected_companies:
-        filtered_df = df[df['Organization'].isin(selected_companies) & (df['Release Date'] >= start_date) & (df['Release Date'] <= end_date)]
+    # An empty key means no company filter; selecting every company is the same as none
+    if len(selected_companies) < len(all_companies):
+        selected_key = tuple(sorted(selected_companies))
     else:
-        filtered_df = df[(df['Release Date'] >= start_date) & (df['Release Date'] <= end_date)]
+        selected_key = ()
+    filtered_df = filter_data(df, selected_key, start_date, end_date)
 
     # RAW DATA toggle switch
     raw_data = st.sidebar.checkbox('Raw Data')
@@ -164,19 +331,18 @@ if not df.empty:
     if raw_data:
         # Display raw data
         st.subheader('Raw data')
-        filtered_df['Release Date'] = filtered_df['Release Date'].dt.strftime('%Y-%m')
-        st.write(filtered_df)
+        # Only send the requested number of rows to the browser, newest first
+        total_rows = max(len(filtered_df), 1)
+        num_rows = st.number_input('Rows to show:', min_value=1, max_value=total_rows, value=min(100, total_rows), step=100)
+        raw_df = filtered_df.iloc[::-1].head(num_rows).reset_index(drop=True)
+        show_release_table(raw_df)
     else:
-        # Create monthly counts by organization
-        monthly_counts = filtered_df.groupby(['Year-Month', 'Organization']).size().unstack(fill_value=0)
-        
-        # Calculate cumulative sums for total available models
-        cumulative_counts = monthly_counts.cumsum()
+        # Create monthly counts by organization, their cumulative sums and the set of months (cached per filter)
+        monthly_counts, cumulative_counts, months_set = compute_monthly(filtered_df, selected_key, start_date, end_date)
+        org_index, month_index = index_filtered(filtered_df, selected_key, start_date, end_date)
 
         # Create a color map for companies
-        companies = filtered_df['Organization'].unique()
-        color_map = px.colors.qualitative.Plotly + px.colors.qualitative.Set1 + px.colors.qualitative.Pastel
-        company_colors = {company: color_map[i % len(color_map)] for i, company in enumerate(companies)}
+        company_colors = build_color_map(tuple(sorted(all_companies)))
 
         # Create the selected graph
         if data_type == "Number of Available Models":
@@ -186,38 +352,8 @@ if not df.empty:
             plot_data = monthly_counts
             title_prefix = 'Newly Released LLM Models per Month'
 
-        if graph_type == "Stacked Area":
-            fig = px.area(plot_data, x=plot_data.index, y=plot_data.columns, 
-                          title=f'{title_prefix} by Company (Stacked Area)',
-                          labels={'value': 'Number of Models', 'Year-Month': 'Month'},
-                          color_discrete_map=company_colors)
-            for trace in fig.data:
-                trace.hovertemplate = "%{customdata[0]}, %{x} (%{y} models)"
-                trace.customdata = [[trace.name] for _ in range(len(trace.x))]
-        elif graph_type == "Line (Total)":
-            plot_data_total = plot_data.sum(axis=1)
-            fig = px.line(x=plot_data_total.index, y=plot_data_total.values,
-                          title=f'{title_prefix} (Total)',
-                          labels={'x': 'Month', 'y': 'Number of Models'},
-                          )
-
-        fig.update_layout(
-            legend=dict(orientation='h', y=-0.2, xanchor='center', x=0.5),
-            hovermode='x unified',
-            xaxis_range=['2022-06', (max_date - pd.DateOffset(months=1)).strftime('%Y-%m')]
-        )
-        
-        # Update hover information to include the company
-        if graph_type == "Stacked Area":
-            for trace in fig.data:
-                trace.hovertemplate = "%{customdata[0]}, %{x} (%{y} models)"
-                trace.customdata = [[trace.name] for _ in range(len(trace.x))]
-        else:
-            fig.update_traces(hovertemplate="%{x} (%{y} models)")
+        fig = GRAPH_BUILDERS[graph_type](plot_data, title_prefix, selected_key, start_date, end_date, company_colors, max_date)
 
-        # Remove the legend
-        fig.update_layout(showlegend=False)
-        
         # Make the graph interactive
         selected_points = plotly_events(fig, click_event=True, hover_event=False)
         
@@ -228,11 +364,10 @@ if not df.empty:
             # Extract year and month from selected_month
             selected_month_str = pd.to_datetime(selected_month).strftime('%Y-%m')
             
-            if selected_month_str in filtered_df['Year-Month'].values:
+            if selected_month_str in months_set:
                 st.subheader(f"Models released in {selected_month_str}")
-                month_df = filtered_df[filtered_df['Year-Month'] == selected_month_str]
-                month_df['Release Date'] = month_df['Release Date'].dt.strftime('%Y-%m')
-                st.dataframe(month_df[['Model', 'Organization', 'Release Date']])
+                month_df = filtered_df.take(month_index[selected_month_str][::-1])
+                show_release_table(month_df[['Model', 'Organization', 'Release Date']])
             else:
                 st.write(f"No data for the selected month: {selected_month_str}")
 
@@ -241,21 +376,7 @@ if not df.empty:
         st.header('Fastest Releasing Companies')
         st.write("This section provides details on the companies with the fastest release cycles. Note: Only companies with more than one model are included in this analysis.")
 
-        # Invert the y-axis to show fastest companies with the highest bars
-        avg_cycles_df['Average Cycle (inverse)'] = 1 / avg_cycles_df['Average Cycle (days)']
-
-        # Create the bar chart for fastest releasing companies with adjusted bar width and inverted y-axis
-        fig_fastest = px.bar(avg_cycles_df, x='Company', y='Average Cycle (inverse)', 
-                             title='Fastest Releasing Companies', 
-                             labels={'Average Cycle (inverse)': 'Speed of Release (1/days)'},
-                             color='Company', color_discrete_map=company_colors,
-                             text='Average Cycle (days)')
-
-        fig_fastest.update_layout(showlegend=False, bargap=0.2)
-
-        # Update hover template to show company and average cycle in days
-        fig_fastest.update_traces(texttemplate='%{text:.1f} days', textposition='outside',
-                                  hovertemplate='%{x}<br>Average Cycle: %{text:.1f} days')
+        fig_fastest = build_fastest_figure(avg_cycles_df, company_colors)
 
         # Display the chart
         st.plotly_chart(fig_fastest)
@@ -266,28 +387,9 @@ if not df.empty:
         st.write("This section provides details on the average release cycle and models released by the selected company.")
         
         # Allow exploration by company
-        company_model_counts = filtered_df['Organization'].value_counts()
-        companies = company_model_counts.index.tolist()
-        company_options = [f"{company} ({count} models)" for company, count in zip(companies, company_model_counts)]
+        company_names, company_options = company_options_for(filtered_df, selected_key, start_date, end_date)
         
-        selected_company_option = st.selectbox('Select a company:', company_options)
-        selected_company = selected_company_option.split(' (')[0]
-
-        company_df = filtered_df[filtered_df['Organization'] == selected_company]
-        
-        # Show company-level release cycle
-        company_days, company_months, company_days_remainder = company_cycles.get(selected_company, (None, None, None))
-        if company_months is not None:
-            st.markdown(f"""
-                <div class="release-cycle">
-                    <i class="fa fa-clock-o release-cycle-icon" aria-hidden="true"></i>
-                    <span class="release-cycle-company">{selected_company}</span> <span> releases a new model every  </span> <span class="release-cycle-time"> {company_months} months and {company_days_remainder} days</span>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        st.write(f"Models released by {selected_company}:")
-        company_df['Release Date'] = company_df['Release Date'].dt.strftime('%Y-%m')
-        st.dataframe(company_df[['Model', 'Release Date']])
+        per_company_section(filtered_df, company_names, company_options, org_index, company_cycles)
         
         # Horizontal line before per month analysis
         st.markdown('---')
@@ -295,13 +397,8 @@ if not df.empty:
         st.write("This section provides details on models released in the selected month.")
         
         # Allow exploration by month
-        months = sorted(filtered_df['Year-Month'].unique(), reverse=True)
-        selected_month = st.selectbox('Select a month:', months, index=0)
-
-        month_df = filtered_df[filtered_df['Year-Month'] == selected_month]
-        month_df['Release Date'] = month_df['Release Date'].dt.strftime('%Y-%m')
-        st.write(f"Models released in {selected_month}:")
-        st.dataframe(month_df[['Model', 'Organization', 'Release Date']])
+        months = monthly_counts.index[::-1].tolist()
+        per_month_section(filtered_df, months, month_index)
 
     # Display data quality issues
     missing_orgs = df['Organization'].isnull().sum()